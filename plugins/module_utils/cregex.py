@@ -1,13 +1,217 @@
 # Clase find patrón en un archivo de configuración
 # By Ed Scrimgalia
 
+import os
 import re
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+
+# regex (PyPI) soporta grupos atómicos en cualquier versión de Python, re los soporta desde 3.11
+try:
+    import regex as re_mod
+except ImportError:
+    import re as re_mod
+
+# hyperscan (opcional) compila varias expresiones en un solo automata, ver RegMatch.scan_many
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+_BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+# clase ([...] o \s, \d, \w) con cuantificador greedy + o *, los escapes se consumen para no partirlos
+_CLASE_CUANTIFICADA = re.compile(r"(\[\^?\]?(?:\\.|[^\]\\])*\]|\\[sSdDwW])([+*])(?![?+])|\\.")
+
+_METACARACTERES = frozenset(".^$*+?{}[]\\|()")
+
+
+@lru_cache(maxsize=1024)
+def _compile(expresion, flags: int):
+    """ 
+    _compile() -> expresión compilada, compartida entre instancias de RegMatch con la misma
+    expresión (str o bytes) y los mismos flags
+    """
+    return re_mod.compile(expresion, flags)
+
+
+def _atomizar(expresion: str) -> str:
+    """ 
+    _atomizar() -> expresión con las clases cuantificadas envueltas en grupos atómicos
+
+    int[a-z]+ [a-z]*[0-9] -> int(?>[a-z]+) (?>[a-z]*)[0-9]
+    """
+    def envolver(match):
+        if match.group(1) is None:
+            return match.group()
+        return f"(?>{match.group(1)}{match.group(2)})"
+
+    return _CLASE_CUANTIFICADA.sub(envolver, expresion)
+
+
+def _prefijo_literal(expresion: str) -> str:
+    """ 
+    _prefijo_literal() -> texto literal con el que empieza todo match de la expresión, o ""
+
+    int[a-z]+ -> "int", inte?rface -> "int", B(?#c)?x -> "", a|b -> ""
+    """
+    if "|" in expresion:
+        return ""
+    fin = 0
+    while fin < len(expresion) and expresion[fin] not in _METACARACTERES:
+        fin += 1
+    # un cuantificador que admite cero repeticiones hace opcional al último caracter,
+    # también si viene después de un comentario (?#...), que no cuenta como átomo
+    if fin < len(expresion) and (expresion[fin] in "*?{" or expresion.startswith("(?#", fin)):
+        fin -= 1
+
+    return expresion[:max(fin, 0)]
+
+
+def _fin_clase(expresion: str, i: int) -> int:
+    # i apunta al "[" de apertura, devuelve la posición del "]" que la cierra o -1
+    j = i + 1
+    if expresion[j:j + 1] == "^":
+        j += 1
+    if expresion[j:j + 1] == "]":
+        j += 1
+    while j < len(expresion):
+        if expresion[j] == "\\":
+            j += 2
+        elif expresion[j] == "]":
+            return j
+        else:
+            j += 1
+
+    return -1
+
+
+def _escape_inseguro(expresion: str, i: int) -> bool:
+    # i apunta a un "\\", los escapes por código (\x41, \101, \N{...}) o por propiedad
+    # unicode (\p{Lu}) pueden representar mayúsculas
+    sig = expresion[i + 1:i + 2]
+    return sig in ("x", "u", "U", "N", "0", "p", "P") or (sig.isdigit() and expresion[i + 2:i + 3].isdigit())
+
+
+def _minusculas_clase(contenido: str):
+    tokens = []
+    i = 0
+    while i < len(contenido):
+        if contenido[i] == "\\":
+            if _escape_inseguro(contenido, i):
+                return None
+            tokens.append(contenido[i:i + 2])
+            i += 2
+        else:
+            tokens.append(contenido[i])
+            i += 1
+
+    salida = []
+    k = 0
+    while k < len(tokens):
+        if k + 2 < len(tokens) and tokens[k + 1] == "-":
+            desde, hasta = tokens[k], tokens[k + 2]
+            if (len(desde) > 1 and desde[1].isalnum()) or (len(hasta) > 1 and hasta[1].isalnum()):
+                return None
+            rango = set(chr(c) for c in range(ord(desde[-1]), ord(hasta[-1]) + 1))
+            minusculas = set(c.lower() for c in rango)
+            if minusculas == rango:
+                salida.append(desde + "-" + hasta)
+            elif desde.isupper() and hasta.isupper() and all(c.isalpha() for c in rango):
+                salida.append(desde.lower() + "-" + hasta.lower())
+            else:
+                # A-z incluye letras y puntuación, se expande a los caracteres en minúscula
+                salida.extend(re.escape(c) for c in sorted(minusculas))
+            k += 3
+        else:
+            salida.append(tokens[k] if len(tokens[k]) > 1 else tokens[k].lower())
+            k += 1
+
+    return "".join(salida)
+
+
+def _minusculas(expresion: str):
+    """ 
+    _minusculas() -> expresión equivalente para buscar case sensitive sobre el texto en
+    minúsculas, o None si la expresión no se puede convertir con seguridad
+
+    Int[A-Z]+ -> int[a-z]+, se mantienen los escapes (\\S, \\W) y los nombres de grupo,
+    también los referenciados por condicionales (?(N)...).
+    """
+    if not expresion.isascii():
+        return None
+    salida = []
+    i = 0
+    while i < len(expresion):
+        c = expresion[i]
+        if c == "\\":
+            if _escape_inseguro(expresion, i):
+                return None
+            salida.append(expresion[i:i + 2])
+            i += 2
+        elif c == "[":
+            fin = _fin_clase(expresion, i)
+            if fin == -1:
+                return None
+            negada = "^" if expresion[i + 1:i + 2] == "^" else ""
+            clase = _minusculas_clase(expresion[i + 1 + len(negada):fin])
+            if clase is None:
+                return None
+            salida.append("[" + negada + clase + "]")
+            i = fin + 1
+        elif (expresion.startswith(("(?P<", "(?P=", "(?<"), i)
+              and not expresion.startswith(("(?<=", "(?<!"), i)):
+            fin = expresion.find(")" if expresion.startswith("(?P=", i) else ">", i)
+            if fin == -1:
+                return None
+            salida.append(expresion[i:fin + 1])
+            i = fin + 1
+        elif expresion.startswith("(?(", i):
+            # condicional (?(nombre)si|no), el nombre o número del grupo se copia sin cambios
+            fin = expresion.find(")", i + 3)
+            if fin == -1:
+                return None
+            salida.append(expresion[i:fin + 1])
+            i = fin + 1
+        elif expresion.startswith("(?", i) and (expresion[i + 2:i + 3] == "-" or expresion[i + 2:i + 3].isalpha()):
+            # flags inline (?i), (?-i:...), se deja el IGNORECASE del motor
+            return None
+        else:
+            salida.append(c.lower())
+            i += 1
+
+    return "".join(salida)
+
 
 class RegMatch():
     """ Clase para reslover matchs en la colección o4n_diff """
-    def __init__(self, expresion, case_sensitive: bool = False) -> None:
+    __slots__ = ("_regexp", "_cs", "_atomic", "_compiled", "_compiled_bytes", "_prefix",
+                 "_plegada", "_compiled_min", "_compiled_min_bytes", "search", "match", "fullmatch",
+                 "sub")
+
+    def __init__(self, expresion, case_sensitive: bool = False, atomic: bool = False) -> None:
         self._regexp = expresion
         self._cs = case_sensitive
+        self._atomic = atomic
+        self._reset()
+
+    def _reset(self):
+        # la expresión str se compila al construir (o al cambiar expreg), un error de sintaxis
+        # aparece en ese momento; la versión bytes se compila al primer uso
+        self._compiled = _compile(self._expresion(), self._flags())
+        # search(), match(), fullmatch() y sub() son los métodos del patrón compilado (texto
+        # str), sin ningún frame intermedio de Python
+        self.search = self._compiled.search
+        self.match = self._compiled.match
+        self.fullmatch = self._compiled.fullmatch
+        self.sub = self._compiled.sub
+        self._compiled_bytes = None
+        self._prefix = None
+        self._plegada = None
+        self._compiled_min = None
+        self._compiled_min_bytes = None
 
     @property
     def expreg(self):
@@ -15,32 +219,196 @@ class RegMatch():
     
     @expreg.setter
     def expreg(self, exp):
-        self._regexp = f"r{exp}"
+        self._regexp = exp
+        self._reset()
 
     @property
     def case_sensitive(self):
         return self._cs
+
+    @property
+    def atomic(self):
+        return self._atomic
+
+    def _expresion(self, expresion=None):
+        # atomic=True evita el backtracking sobre clases adyacentes, ej: [a-z]+\s*[a-zA-z]+
+        expresion = self._regexp if expresion is None else expresion
+        if self._atomic:
+            return _atomizar(expresion)
+
+        return expresion
+
+    def _flags(self):
+        return 0 if self._cs else re_mod.IGNORECASE
     
     def pattern(self):
-        if not self._cs:
-            return re.compile(self.expreg, re.IGNORECASE)
+        """ 
+        pattern() -> expresión compilada al construir la instancia
+        """
+        return self._compiled
+
+    def pattern_bytes(self):
+        """ 
+        pattern_bytes() -> expresión compilada en modo bytes, para buscar sobre bytes o mmap
+        """
+        if self._compiled_bytes is None:
+            self._compiled_bytes = _compile(self._expresion().encode(), self._flags())
+
+        return self._compiled_bytes
+
+    def _pattern_for(self, texto):
+        # se lee el slot directo sin la llamada a pattern()
+        if isinstance(texto, _BUFFER_TYPES):
+            return self._compiled_bytes or self.pattern_bytes()
+
+        return self._compiled
+
+    def _prefijo(self, texto):
+        # con IGNORECASE el prefijo solo sirve si no tiene letras, find() distingue mayúsculas
+        if self._prefix is None:
+            prefix = _prefijo_literal(self._regexp)
+            if not self._cs and prefix.lower() != prefix.upper():
+                prefix = ""
+            self._prefix = prefix
+        if not self._prefix or isinstance(texto, memoryview):
+            return ""
+        if isinstance(texto, _BUFFER_TYPES):
+            return self._prefix.encode()
+
+        return self._prefix
+
+    def _plegado(self, texto):
+        """ 
+        _plegado() -> (patrón, texto en minúsculas, prefijo) o None
+
+        Sin case_sensitive, IGNORECASE pliega mayúsculas en cada intento de match y anula el
+        uso del prefijo literal. Se pasa el texto a minúsculas una sola vez y se busca con la
+        expresión en minúsculas, case sensitive. Los offsets son los mismos que en el texto
+        original. Aplica a texto str ASCII, bytes y bytearray.
+        """
+        if self._cs:
+            return None
+        if self._plegada is None:
+            expresion = _minusculas(self._regexp)
+            self._plegada = False if expresion is None else (expresion, _prefijo_literal(expresion))
+        if not self._plegada:
+            return None
+        expresion, prefix = self._plegada
+        if isinstance(texto, (bytes, bytearray)):
+            if self._compiled_min_bytes is None:
+                self._compiled_min_bytes = _compile(self._expresion(expresion).encode(), 0)
+            return self._compiled_min_bytes, texto.lower(), prefix.encode()
+        if isinstance(texto, str) and texto.isascii():
+            if self._compiled_min is None:
+                self._compiled_min = _compile(self._expresion(expresion), 0)
+            return self._compiled_min, texto.lower(), prefix
+
+        return None
+
+    def _candidatos(self, texto, plegado):
+        """ 
+        _candidatos() -> (patrón, generador de match objects sobre el texto de búsqueda)
+
+        plegado es el resultado de _plegado(texto). Los match objects pueden referirse al
+        texto en minúsculas, los valores se toman del texto original con los spans.
+        """
+        if plegado is None:
+            p, busqueda, prefix = self._pattern_for(texto), texto, self._prefijo(texto)
         else:
-            return re.compile(self.expreg)
-        
+            p, busqueda, prefix = plegado
+
+        def matches():
+            if prefix:
+                # el match solo puede empezar donde aparece el prefijo, find() ubica los
+                # candidatos y el patrón se evalúa solo en esas posiciones
+                find = busqueda.find
+                i = find(prefix)
+                while i != -1:
+                    m = p.match(busqueda, i)
+                    if m:
+                        yield m
+                        i = find(prefix, m.end())
+                    else:
+                        i = find(prefix, i + 1)
+            else:
+                search = p.scanner(busqueda).search
+                m = search()
+                while m:
+                    yield m
+                    m = search()
+
+        return p, matches()
+
     def lector(self, file_path):
-        with open(file_path, "r") as file:
-            file_as_text = file.read()
+        """ 
+        lector() -> contenido del archivo como str
+
+        Se lee en binario con un buffer de 8 MiB y se decodifica una sola vez en UTF-8, los
+        bytes inválidos se conservan con surrogateescape. Los fines de línea se normalizan a
+        \\n como en la lectura en modo texto.
+        """
+        with open(file_path, "rb", buffering=1 << 23) as file:
+            data = file.read()
+
+        if b"\r" in data:
+            data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        file_as_text = data.decode("utf-8", errors="surrogateescape")
 
         return file_as_text
+
+    @contextmanager
+    def lector_mmap(self, file_path):
+        """ 
+        lector_mmap() -> archivo mapeado en memoria (solo lectura), sin copiarlo a un str
+
+        with r.lector_mmap("config.txt") as mm:
+            lista = r.findall(mm)
+
+        Los matches se devuelven como bytes. Un archivo vacío se entrega como b"".
+        """
+        with open(file_path, "rb") as file:
+            if file.seek(0, 2) == 0:
+                yield b""
+                return
+            mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            yield mm
+        finally:
+            mm.close()
     
     def findall(self, texto: str):
         """ 
         findall() -> lista de matches
         """
-        match = self.pattern().findall(texto)
+        plegado = self._plegado(texto)
+        if plegado is None and not self._prefijo(texto):
+            return self._pattern_for(texto).findall(texto)
+
+        p, matches = self._candidatos(texto, plegado)
+        vacio = b"" if isinstance(texto, _BUFFER_TYPES) else ""
+        match = []
+        for m in matches:
+            if p.groups == 0:
+                match.append(texto[m.start():m.end()])
+            else:
+                grupos = tuple(texto[start:end] if start != -1 else vacio
+                               for start, end in (m.span(g) for g in range(1, p.groups + 1)))
+                match.append(grupos[0] if p.groups == 1 else grupos)
 
         return match
 
+    def match_first(self, texto: str):
+        """ 
+        match_first() -> primer match del texto, o None
+
+        findall() recorre todo el texto, match_first() se detiene en la primera coincidencia,
+        alcanza para saber si una línea cumple con la expresión. Con bytes devuelve bytes.
+        """
+        match = self._pattern_for(texto).search(texto)
+
+        return match.group() if match else None
+
     def finditer(self, texto: str):
         """ 
         finditer() -> secuencia de match object (iterable)
@@ -51,10 +419,156 @@ class RegMatch():
         (29, 31) -> match en posisión veintinueve dos caracteres
         """
 
-        match = self.pattern().finditer(texto)
+        match = self._pattern_for(texto).finditer(texto)
 
         return match
 
+    def findall_spans(self, texto: str):
+        """
+        findall_spans() -> lista de (start, end, match)
+
+        Equivale a [(m.start(), m.end(), m.group()) for m in finditer(texto)], recorre el
+        scanner del patrón sin pasar por el protocolo de iteración.
+        """
+        spans = []
+        append = spans.append
+        for match in self._candidatos(texto, self._plegado(texto))[1]:
+            start, end = match.span()
+            append((start, end, texto[start:end]))
+
+        return spans
+
+    def finditer_spans(self, texto: str):
+        """
+        finditer_spans() -> generador de (start, end)
+
+        Para quien solo necesita las posiciones, cada match object se libera al producir su
+        span en lugar de quedar retenido junto con la referencia al texto.
+        """
+        for match in self._candidatos(texto, self._plegado(texto))[1]:
+            yield match.span()
+
+    def finditer_file(self, file_path, chunk: int = 1 << 20, overlap: int = 4096):
+        """
+        finditer_file() -> generador de (start, end, match) sobre el archivo, leído por bloques
+
+        El archivo se recorre en ventanas de chunk + overlap bytes, la memoria usada no
+        depende del tamaño del archivo. start y end son offsets en bytes dentro del archivo
+        y match se entrega como bytes.
+
+        overlap debe ser mayor que el match más largo posible de la expresión, un match que
+        no entra en la ventana se pierde. Anclas (^, $) y lookbehind se evalúan contra la
+        ventana, no contra el archivo completo.
+        """
+        p = self.pattern_bytes()
+        with open(file_path, "rb") as file:
+            offset = 0
+            last_end = 0
+            last_empty = -1
+            buf = file.read(chunk + overlap)
+            # un archivo vacío se recorre una vez, como lo haría finditer sobre b""
+            while True:
+                tail = file.read(chunk)
+                # en la última ventana vale también un match vacío al final del archivo
+                limit = chunk if tail else len(buf) + 1
+                # cada ventana se recorre desde el fin del último match, no desde su inicio: un
+                # match descartado por solaparse haría saltar a finditer por encima de matches
+                # válidos que empiezan dentro de él
+                for match in p.finditer(buf, max(0, last_end - offset)):
+                    if match.start() >= limit:
+                        break
+                    start = offset + match.start()
+                    if start == match.end() + offset == last_empty:
+                        # el match vacío ya se entregó con la ventana anterior
+                        continue
+                    last_end = offset + match.end()
+                    if start == last_end:
+                        last_empty = start
+                    yield start, last_end, match.group()
+                if not tail:
+                    break
+                buf = buf[chunk:] + tail
+                offset += chunk
+
+    def findall_files(self, paths: list):
+        """ 
+        findall_files() -> diccionario {path: lista de matches} para varios archivos
+
+        Cada archivo se lee en binario y se busca en un hilo propio, re libera el GIL mientras
+        recorre bytes, así la lectura y la búsqueda de distintos archivos se solapan. Los
+        matches se devuelven como bytes.
+        """
+        def scan(path):
+            with open(path, "rb") as file:
+                return path, self.findall(file.read())
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return dict(executor.map(scan, paths))
+
+    @classmethod
+    def combine(cls, patterns: list):
+        """ 
+        combine() -> RegMatchCombinado, una sola expresión con una alternativa por patrón
+
+        (?P<p0>...)|(?P<p1>...)|... recorre el texto una vez en lugar de una vez por patrón.
+        Cada alternativa conserva su case_sensitive con flags inline. Las expresiones no
+        pueden usar backreferences numéricas ni repetir nombres de grupo entre sí.
+        """
+        alternativas = []
+        for indice, p in enumerate(patterns):
+            flags = "" if p.case_sensitive else "i"
+            alternativas.append(f"(?P<p{indice}>(?{flags}:{p._expresion()}))")
+
+        return RegMatchCombinado("|".join(alternativas), case_sensitive=True)
+
+    @classmethod
+    def scan_many(cls, patterns: list, texto):
+        """ 
+        scan_many() -> lista de (indice, start, end), indice es la posición en patterns
+
+        Busca todas las expresiones (objetos RegMatch) sobre el texto. Con hyperscan instalado
+        el texto se recorre una sola vez para todas las expresiones, en ese caso se reportan
+        todos los finales de match que encuentra hyperscan. Sin hyperscan, con texto str no
+        ASCII o con expresiones que hyperscan no soporta (backreferences, lookaround, grupos
+        atómicos) se recorre el texto una vez por expresión con finditer.
+        """
+        resultados = []
+        if hyperscan is not None and (isinstance(texto, _BUFFER_TYPES) or texto.isascii()):
+            data = texto if isinstance(texto, _BUFFER_TYPES) else texto.encode()
+            flags = [hyperscan.HS_FLAG_SOM_LEFTMOST | (0 if p.case_sensitive else hyperscan.HS_FLAG_CASELESS)
+                     for p in patterns]
+            db = hyperscan.Database()
+            try:
+                db.compile(expressions=[p._expresion().encode() for p in patterns],
+                           ids=list(range(len(patterns))),
+                           flags=flags)
+            except hyperscan.error:
+                db = None
+            if db is not None:
+                def on_match(indice, start, end, flags, context):
+                    resultados.append((indice, start, end))
+
+                db.scan(data, match_event_handler=on_match)
+                return sorted(resultados, key=lambda r: (r[1], r[0]))
+
+        for indice, p in enumerate(patterns):
+            resultados.extend((indice, match.start(), match.end()) for match in p.finditer(texto))
+
+        return sorted(resultados, key=lambda r: (r[1], r[0]))
+
+
+class RegMatchCombinado(RegMatch):
+    """ Expresión creada por RegMatch.combine() """
+    __slots__ = ()
+
+    def finditer(self, texto: str):
+        """ 
+        finditer() -> secuencia de (indice, match object), indice es la posición del patrón
+        en la lista recibida por combine()
+        """
+        for match in super().finditer(texto):
+            yield int(match.lastgroup[1:]), match
+
 
 if __name__ == "__main__":
     
@@ -120,7 +120,8 @@ output:
             "block_to_add": "-Current configuration with default configurations exposed : 49852 bytes\n-ip cef load-sharing algorithm universal CC1B726F\n",
             "block_to_del": "+Current configuration with default configurations exposed : 49759 bytes\n+ip cef load-sharing algorithm universal ECC34684\n+ipv6",
             },
-            "Total_execution_time": "0:00:00.016707"
+            "Total_execution_time": "0:00:00.016707",
+            "Total_execution_time_s": 0.016707
         }
     }
     "salidadiff_common_context_match_full": {
@@ -150,7 +151,8 @@ output:
                 "trunk...",
               ]
             },
-            "Total_execution_time": "0:00:00.009611"}
+            "Total_execution_time": "0:00:00.009611",
+            "Total_execution_time_s": 0.009611}
         }
         ]
     }
@@ -191,7 +193,8 @@ output:
               "trunk...",
             ]
           },
-          "Total_execution_time": "0:00:00.050088"}
+          "Total_execution_time": "0:00:00.050088",
+          "Total_execution_time_s": 0.050088}
       }
       ]
     }
@@ -231,6 +234,7 @@ output:
               "delta_results": "--- baseline\n+++ comparison\n\n\n+   1: * Cisco in writing.                                                      *\n+   2: * IOSv is strictly limited to use for evaluation, demonstration and IOS  *\n+   3: * Technical Advisory Center. Any use or disclosure, in whole or in part, *\n+   4: * education. IOSv is provided as-is and is not supported by Cisco's      *\n+   5: * of the IOSv Software or Documentation to any third party for any       *\n+   6: * purposes is expressly prohibited except as otherwise authorized by     *\n+   7: **************************************************\n+   8: **************************************************************************\n+   9: **************************************************************************^C\n+  10: Building configuration...\n+  11: Current configuration with default configurations exposed : 49759 bytes\n+  12: access-session vlan-assignment ignore-errors\n+  13: alias exec h help\n+  14: alias exec lo logout\n+  15: alias exec p ping\n+  16: alias exec r resume\n+  17: alias exec s show\n+  18: alias exec u undebug\n+  19: alias exec un undebug\n+  20: alias exec w where\n+  21: archive\n+ trunk...",
             },
           "Total_execution_time": "0:00:00.261768",
+          "Total_execution_time_s": 0.261768,
           }
         }
         ]
@@ -239,11 +243,259 @@ output:
 
 # Modulos
 from ansible.module_utils.basic import AnsibleModule
-from datetime import datetime
-from collections import OrderedDict
-import difflib
-import diffios
+from datetime import timedelta
+import bisect
+import itertools
 import re
+import sys
+import time
+# pyahocorasick (opcional) busca todas las lineas del contexto en una sola pasada por la config
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+# cdifflib (opcional) es la misma SequenceMatcher de difflib implementada en C, con igual salida
+try:
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+except ImportError:
+    from difflib import SequenceMatcher
+
+# ACL patterns (compiled once) and header prefix, shared by clr_pos and find_context_var
+_RE_ACL_SEQ = re.compile(r"^\s+\d+\s+(?:permit|deny).")
+_ACL_PREFIX = "ip access-list"
+# unanchored form of ".+(?:permit|deny)\s+.+", searched from the 2nd char, no backtracking on long lines
+_RE_ACL_RULE = re.compile(r"(?:permit|deny)\s.")
+# edit distance from which myers_opcodes gives up and the diff falls back to SequenceMatcher: the cost of
+# Myers grows with (lines * edits), fine for a config close to its template, not for two unrelated files
+_MYERS_MAX_D = 1000
+
+
+def compare_once(_baseline: list, _comparison: list):
+#this func returns a diffios comparison that computes its result only once. diffios recomputes the
+#whole comparison on every delta, missing and additional call, and it is imported here because
+#only match_type var uses it, so config and context full/include runs skip its import time
+    import diffios
+
+    class CompareOnce(diffios.Compare):
+        def _search(self):
+            try:
+                return self._search_result
+            except AttributeError:
+                self._search_result = super()._search()
+                return self._search_result
+
+        @staticmethod
+        def _changes_lines(data):
+            # same lines as pprint_missing/pprint_additional split on newlines, without building the text
+            lines = []
+            for ind, group in enumerate(data):
+                if ind > 0:
+                    lines.append('')
+                lines.extend(group if group else [''])
+            return lines if lines else ['']
+
+        @staticmethod
+        def _delta_format(data, prefix):
+            # same text as diffios _pprint_format, joined once instead of growing a string per group
+            child = "\n{}      ".format(prefix)
+            deltas = []
+            for i, group in enumerate(data, 1):
+                deltas.append("\n{} {:>3}: {}".format(prefix, i, group[0]))
+                if len(group) > 1:
+                    deltas.append(child + child.join(group[1:]))
+            return "".join(deltas)
+
+        def delta(self):
+            return ("--- baseline\n"
+                    "+++ comparison"
+                    "\n{0}"
+                    "\n{1}"
+                    "\n").format(self._delta_format(self.missing(), '-'), self._delta_format(self.additional(), '+'))
+
+        def missing_lines(self):
+            return self._changes_lines(self.missing())
+
+        def additional_lines(self):
+            return self._changes_lines(self.additional())
+
+    return CompareOnce(_baseline, _comparison)
+
+
+def is_acl_header(_line: str):
+#this func tells if the line opens an acl (ip access-list ...) or closes it (!), without a regex per line
+    return _line.startswith("!") or (len(_line) > len(_ACL_PREFIX) and _line.startswith(_ACL_PREFIX))
+
+
+def unified_range(_start: int, _stop: int):
+#this func formats a hunk range as difflib does: "start,length", or just "start" for one line
+    beginning = _start + 1
+    length = _stop - _start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def myers_opcodes(_str1: list, _str2: list, _max_d=_MYERS_MAX_D):
+#this func returns the opcodes (as SequenceMatcher.get_opcodes) of a shortest edit script from _str1 to _str2,
+#found with the greedy O((N+M)D) algorithm of Myers (1986), or None when more than _max_d edits are needed.
+#the forward pass keeps, per round d, the furthest x reached on each diagonal k = x - y; the backtrack
+#reuses the snapshot of each round to walk the snakes back from (N, M) to (0, 0)
+    n, m = len(_str1), len(_str2)
+    # the common head and tail lines are matched up front, Myers runs only over the changed region
+    head = 0
+    while head < n and head < m and _str1[head] == _str2[head]:
+        head += 1
+    tail = 0
+    while tail < n - head and tail < m - head and _str1[n - 1 - tail] == _str2[m - 1 - tail]:
+        tail += 1
+    a, b = _str1[head:n - tail], _str2[head:m - tail]
+    an, bm = len(a), len(b)
+
+    offset = min(an + bm, _max_d) + 1
+    v = [0] * (2 * offset + 1)
+    trace = []
+    found = False
+    for d in range(min(an + bm, _max_d) + 1):
+        # only diagonals -d..d can be read in round d, a slice of them is enough to backtrack
+        trace.append(v[offset - d:offset + d + 1])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < an and y < bm and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= an and y >= bm:
+                found = True
+                break
+        if found:
+            break
+    if not found:
+        return None
+
+    # snakes as matching blocks (i, j, size), from the end back to the start
+    blocks = [(n, m, 0), (n - tail, m - tail, tail)]
+    x, y = an, bm
+    for d in range(len(trace) - 1, -1, -1):
+        k = x - y
+        if d == 0:
+            prev_x = prev_y = 0
+        else:
+            vd = trace[d]
+            if k == -d or (k != d and vd[k - 1 + d] < vd[k + 1 + d]):
+                prev_k = k + 1
+            else:
+                prev_k = k - 1
+            prev_x = vd[prev_k + d]
+            prev_y = prev_x - prev_k
+        # the snake starts after the single edit that leaves (prev_x, prev_y)
+        start_x = prev_x if d == 0 else (prev_x if prev_k == k + 1 else prev_x + 1)
+        if x > start_x:
+            blocks.append((head + start_x, head + start_x - k, x - start_x))
+        x, y = prev_x, prev_y
+    blocks.append((0, 0, head))
+    blocks.reverse()
+
+    # same translation of matching blocks to opcodes as SequenceMatcher.get_opcodes
+    opcodes = []
+    i = j = 0
+    for ai, bj, size in blocks:
+        if i < ai and j < bj:
+            opcodes.append(('replace', i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(('delete', i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(('insert', i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            opcodes.append(('equal', ai, i, bj, j))
+    return opcodes
+
+
+def grouped_opcodes(_opcodes: list, _lines_in_context=3):
+#this func groups the opcodes in hunks with up to _lines_in_context lines of context, as
+#SequenceMatcher.get_grouped_opcodes does
+    codes = list(_opcodes) or [('equal', 0, 1, 0, 1)]
+    n = _lines_in_context
+    if codes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        # a long run of equal lines closes the hunk, keeping n lines on each side as context
+        if tag == 'equal' and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        yield group
+
+
+def unified_diff(_str1: list, _str2: list, _lines_in_context=3):
+#this func is the single entry point to the diff engine used by config and context full.
+#same format as difflib.unified_diff. The edit script comes from myers_opcodes, a shortest one, which for
+#a config with a few changes against its template costs a pass over the lines plus the edits.
+#Past _MYERS_MAX_D edits it falls back to SequenceMatcher (cdifflib when installed, else difflib) with
+#autojunk=False: from 200 lines on, autojunk drops every line repeated in more than 1% of the config
+#("!", " no shutdown", acl remarks...) from the matching, which widens the hunks and can pair blocks of
+#the wrong interface.
+    if _str1 == _str2:
+        # already compliant, identical files give no hunks: skip building the matcher
+        return
+    started = False
+    opcodes = myers_opcodes(_str1, _str2)
+    if opcodes is None:
+        opcodes = SequenceMatcher(None, _str1, _str2, autojunk=False).get_opcodes()
+    for group in grouped_opcodes(opcodes, _lines_in_context):
+        if not started:
+            started = True
+            yield '--- original'
+            yield '+++ current'
+        first, last = group[0], group[-1]
+        yield f"@@ -{unified_range(first[1], last[2])} +{unified_range(first[3], last[4])} @@"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                for line in _str1[i1:i2]:
+                    yield ' ' + line
+                continue
+            if tag in {'replace', 'delete'}:
+                for line in _str1[i1:i2]:
+                    yield '-' + line
+            if tag in {'replace', 'insert'}:
+                for line in _str2[j1:j2]:
+                    yield '+' + line
+
+
+def read_lines(_path: str):
+#this func returns the lines of the file trimmed as read().strip().splitlines(), without copying the whole text.
+#the file is read in binary mode and decoded once, splitlines already handles \n, \r\n and \r so the
+#universal newline translation of text mode is skipped
+    with open(_path, 'rb', buffering=0) as f:
+        lines = f.read().decode('utf-8').splitlines()
+    while lines and (not lines[-1] or lines[-1].isspace()):
+        lines.pop()
+    start = 0
+    while start < len(lines) and (not lines[start] or lines[start].isspace()):
+        start += 1
+    if start > 0:
+        del lines[:start]
+    if lines:
+        lines[0] = lines[0].lstrip()
+        lines[-1] = lines[-1].rstrip()
+
+    # configs repeat the same lines ("!", " no shutdown", " exit"...), interned they are one object each and
+    # equality checks between both files resolve on identity
+    return [sys.intern(line) for line in lines]
 
 
 def open_files(_original, _current):
@@ -251,25 +503,21 @@ def open_files(_original, _current):
     str1 = ""
     success_origin_current = False
     try:
-        f = open(_original, 'r')
+        str1 = read_lines(_original)
     except Exception as error:
         ret_msg = f"No se pudo abrir el archivo {_original}, error {error}"
         success_origin = False
     else:
-        str1 = f.read().strip().splitlines()
-        f.close()
         ret_msg = f"Archivos {_original} abiertos correctamente"
         success_origin = True
 
     if success_origin:
         try:
-            f = open(_current, 'r')
+            str2 = read_lines(_current)
         except Exception as error:
             ret_msg = f"No se pudo abrir el archivo {_current}, error {error}"
             success_origin_current = False
         else:
-            str2 = f.read().strip().splitlines()
-            f.close()
             if len(str1) > 0 and len(str2) > 0:
                 ret_msg = f"Archivos {_original} y {_current} abiertos correctamente"
                 success_origin_current = True
@@ -280,87 +528,71 @@ def open_files(_original, _current):
     return str1, str2, success_origin_current, ret_msg
 
 
+def clr_line(_line: str):
+#this func drops the indentation and sequence number of an acl line, " 10 permit ip any any" -> " permit ip any any"
+    return ' ' + _line.split(None, 1)[1]
+
+
 def clr_pos(_strcl:list):
 #this func clean acl position, because in comparision with acl template we can have a same element but different position
-    for line_str in _strcl:
-      positioni = _strcl.index(line_str)
-      if re.match(r"^\s+\d+\s+permit.+$|^\s+\d+\s+deny.+$", line_str):
-          line_strs = line_str.split(' ')
-          for line_sp in line_strs:
-              if line_strs.index(line_sp) == 2:
-                  line_str = ' ' + line_sp
-              elif line_strs.index(line_sp) != 0 or line_strs.index(line_sp) != 1 or line_strs.index(line_sp) != 2:
-                  line_str = line_str + ' ' + line_sp
-          _strcl[positioni] = line_str
+    return [clr_line(line_str) if _RE_ACL_SEQ.match(line_str) else line_str for line_str in _strcl]
+
+
+def block_of_lines(_block_list: list, _parents: list, _ignore: tuple, _lines: list):
+#this func returns the lines to modify joined, each indented line preceded by its mayor line (line not indented),
+#or False when there is none
+    new_lines = []
+    mayor_line_not_indented = None
+    for line_to_mod in _lines:
+        ind_in_bloc = line_to_mod[0]
+        cmd_in_block = _block_list[ind_in_bloc]
+        cmd_in_block_mod = cmd_in_block[1:]
+        # a blank line carries no command
+        if not cmd_in_block_mod or any(char in cmd_in_block_mod for char in _ignore):
+            continue
+        if not cmd_in_block_mod.startswith(" "):
+            if mayor_line_not_indented != cmd_in_block_mod:
+                new_lines.append(cmd_in_block)
+                mayor_line_not_indented = cmd_in_block_mod
+        else:
+            parent = _parents[ind_in_bloc]
+            if parent >= 0:
+                cmd_line_mod = _block_list[parent][1:]
+                if mayor_line_not_indented != cmd_line_mod:
+                    new_lines.append(" " + _block_list[parent])
+                    mayor_line_not_indented = cmd_line_mod
+                new_lines.append(cmd_in_block)
 
-    return _strcl
+    return '\n'.join(new_lines) if len(new_lines) > 0 else False
 
 
-def find_block_of_config_to_modify(_list_char_ignore, _block="", _lines_to_add="", _lines_to_delete=""):
+def find_block_of_config_to_modify(_list_char_ignore, _block=(), _lines_to_add="", _lines_to_delete=""):
+    # _block is the list of diff lines without the file headers, as returned by find_config_diff, so the
+    # positions in _lines_to_add and _lines_to_delete index it directly
     ret_msg = ""
-    block_list = _block.splitlines() if _block else []
-    new_block_list = [i for i in block_list if not i.startswith("---")] if len(block_list) > 0 else []
-    new_block_list = [i for i in new_block_list if not i.startswith("+++")] if len(new_block_list) > 0 else []
-    tuplas_new_block_list = list(enumerate((new_block_list)))
+    new_block_list = _block
+    # per line of the block, the nearest mayor line (line not indented) at or above it, -1 when there is
+    # none. Blank lines are not mayor lines
+    parents = []
+    last_head = -1
+    for ind, line in enumerate(new_block_list):
+        if len(line) > 1 and line[1] != ' ':
+            last_head = ind
+        parents.append(last_head)
+    # only single characters can match, as with the old per-char list check. With the usual two or three
+    # characters, one C level substring search per char beats a set or translate table over the line
+    ignore = tuple(dict.fromkeys(ele for ele in _list_char_ignore if isinstance(ele, str) and len(ele) == 1))
 
     # finding the mayor line in line_to_add (line not indented)
-    new_lines_to_add = []
-    mayor_line_not_indented = None
-    new_lines_to_add_str = None
     try:
-        for line_to_add in _lines_to_add:
-            line_in_block = tuplas_new_block_list[line_to_add[0]]
-            ind_in_bloc = line_in_block[0]
-            cmd_in_block = line_in_block[1]
-            cmd_in_block_mod = cmd_in_block.replace(cmd_in_block[0], "", 1)
-            cmd_in_block_mod_list = [char for char in cmd_in_block_mod if char]
-            exist_ignored_char = [ele for ele in _list_char_ignore if ele in cmd_in_block_mod_list]
-            if cmd_in_block_mod[0] != " " and len(exist_ignored_char) == 0:
-                if mayor_line_not_indented != cmd_in_block_mod:
-                    new_lines_to_add.append(cmd_in_block)
-                    mayor_line_not_indented = cmd_in_block_mod
-            elif len(exist_ignored_char) == 0:
-                for line in tuplas_new_block_list[ind_in_bloc::-1]:
-                    cmd_line = line[1]
-                    cmd_line_mod = cmd_line.replace(cmd_line[0], "", 1)
-                    if cmd_line_mod[0] != ' ':
-                        if mayor_line_not_indented != cmd_line_mod:
-                            new_lines_to_add.append(" "+cmd_line)
-                            mayor_line_not_indented = cmd_line_mod
-                        new_lines_to_add.append(cmd_in_block)
-                        break
-        new_lines_to_add_str = '\n'.join(new_lines_to_add) if len(new_lines_to_add) > 0 else False
+        new_lines_to_add_str = block_of_lines(new_block_list, parents, ignore, _lines_to_add)
     except Exception as error:
         ret_msg = "Error finding block to add, {}".format(error)
         new_lines_to_add_str = False
 
     # finding the mayor line in line_to_del (line not indented)
-    new_lines_to_del_str = None
-    mayor_line_not_indented = None
-    new_lines_to_del = []
     try:
-        for line_to_del in _lines_to_delete:
-            line_in_block = tuplas_new_block_list[line_to_del[0]]
-            ind_in_bloc = line_in_block[0]
-            cmd_in_block = line_in_block[1]
-            cmd_in_block_mod = cmd_in_block.replace(cmd_in_block[0], "", 1)
-            cmd_in_block_mod_list = [char for char in cmd_in_block_mod if char]
-            exist_ignored_char = [ele for ele in _list_char_ignore if ele in cmd_in_block_mod_list]
-            if cmd_in_block_mod[0] != " " and len(exist_ignored_char) == 0:
-                if mayor_line_not_indented != cmd_in_block_mod:
-                    new_lines_to_del.append(cmd_in_block)
-                    mayor_line_not_indented = cmd_in_block_mod
-            elif len(exist_ignored_char) == 0:
-                for line in tuplas_new_block_list[ind_in_bloc::-1]:
-                    cmd_line = line[1]
-                    cmd_line_mod = cmd_line.replace(cmd_line[0], "", 1)
-                    if cmd_line_mod[0] != ' ':
-                        if mayor_line_not_indented != cmd_line_mod:
-                            new_lines_to_del.append(" "+cmd_line)
-                            mayor_line_not_indented = cmd_line_mod
-                        new_lines_to_del.append(cmd_in_block)
-                        break
-        new_lines_to_del_str = '\n'.join(new_lines_to_del) if len(new_lines_to_del) > 0 else False
+        new_lines_to_del_str = block_of_lines(new_block_list, parents, ignore, _lines_to_delete)
     except Exception as error:
         ret_msg = "Error finding block to Delete, {}".format(error)
         new_lines_to_del_str = False
@@ -368,17 +600,49 @@ def find_block_of_config_to_modify(_list_char_ignore, _block="", _lines_to_add="
     return ret_msg, new_lines_to_add_str, new_lines_to_del_str
 
 
+def lines_containing(_str1: list, _keys: list):
+#this func maps every key to the positions (in order) of the config lines that include it
+    hits = {key: [] for key in _keys}
+    if len(_str1) == 0:
+        return hits
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for key in hits:
+            if key:
+                automaton.add_word(key, key)
+        if len(automaton) > 0:
+            automaton.make_automaton()
+            for pos, line in enumerate(_str1):
+                for key in {found[1] for found in automaton.iter(line)}:
+                    hits[key].append(pos)
+        if "" in hits:
+            hits[""] = list(range(len(_str1)))
+        return hits
+    # without the automaton, search each key over the whole config jumping to the next line on every hit
+    text = '\n'.join(_str1)
+    starts = [0]
+    for line in _str1[:-1]:
+        starts.append(starts[-1] + len(line) + 1)
+    for key, positions in hits.items():
+        ind = text.find(key)
+        while ind != -1:
+            pos = bisect.bisect_right(starts, ind) - 1
+            positions.append(pos)
+            if pos + 1 == len(starts):
+                break
+            ind = text.find(key, starts[pos + 1])
+
+    return hits
+
+
 def find_context_included(_str1: list, _str2: list, _context_name: str, _match_type: str):
-    salida_json = OrderedDict()
-    line_inc_dic = OrderedDict()
+    salida_json = {}
+    line_inc_dic = {}
     lines_not_included = []
     try:
+        hits = lines_containing(_str1, _str2)
         for line_in_context in _str2:
-            lines_included = []
-            for line_in_conf in _str1:
-                if line_in_context in line_in_conf:
-                    line = f"Line included in config line: {line_in_conf}"
-                    lines_included.append(line)
+            lines_included = [f"Line included in config line: {_str1[pos]}" for pos in hits[line_in_context]]
             if len(lines_included) >= 1:
                 line_inc_dic[line_in_context] = lines_included
             else:
@@ -398,11 +662,11 @@ def find_context_included(_str1: list, _str2: list, _context_name: str, _match_t
 
 
 def find_context_diff(_str1: list, _str2: list, _context_name: str, _match_type: str, _lines_in_context=3):
-    salida_json = OrderedDict()
+    salida_json = {}
     try:
-        diff = difflib.unified_diff(_str1, _str2, fromfile='original', tofile='current', n=_lines_in_context, lineterm='')
-        lines_to_add_config_file = [ele for ele in diff if not ele.startswith("-") and not ele.startswith("+++ current")
-        and ele.startswith("+")]
+        diff = unified_diff(_str1, _str2, _lines_in_context)
+        # the first two lines are the file headers, every other line starting with + is an added line
+        lines_to_add_config_file = [ele for ele in itertools.islice(diff, 2, None) if ele[:1] == "+"]
         salida_json['match_type'] = _match_type
         salida_json['context_name'] = _context_name
         salida_json['original_context'] = _str2
@@ -417,17 +681,20 @@ def find_context_diff(_str1: list, _str2: list, _context_name: str, _match_type:
 
 
 def find_config_diff(_str1: list, _str2: list, _lines_in_context=3):
-    salida_json = OrderedDict()
+    salida_json = {}
     added = []
-    diff = difflib.unified_diff(_str1, _str2, fromfile='original', tofile='current', n=_lines_in_context, lineterm='')
-    salida_json["diff"] = '\n'.join([str(elem) for elem in diff])
-    diff = difflib.unified_diff(_str1, _str2, fromfile='original', tofile='current', n=_lines_in_context, lineterm='')
-    lines = list(diff)[2:]
-    if (len(lines) == 0):
-        salida_json["diff"] = []
-    list_enum_lines = list(enumerate(lines))
-    added = [line for line in list_enum_lines if line[1][0] == '+']
-    removed = [line for line in list_enum_lines if line[1][0] == '-']
+    removed = []
+    chunks = []
+    # single pass over the diff, the first two lines are the file headers
+    diff = unified_diff(_str1, _str2, _lines_in_context)
+    for ind, line in enumerate(diff, -2):
+        chunks.append(line)
+        if ind >= 0:
+            if line[:1] == '+':
+                added.append((ind, line))
+            elif line[:1] == '-':
+                removed.append((ind, line))
+    salida_json["diff"] = '\n'.join(chunks) if len(chunks) > 2 else []
     success = True
 
     if len(added) > 0:
@@ -444,83 +711,80 @@ def find_config_diff(_str1: list, _str2: list, _lines_in_context=3):
         salida_json["lines_to_add"] = []
         ret_msg = "No differences found"
 
-    return salida_json, success, ret_msg
+    return salida_json, success, ret_msg, chunks[2:]
 
 
 def find_context_var(_str1: list, _str2: list, _context_name: str, _match_type: str, _var=5): #_current_cfg, _template, _match_type, _var
-    tpl = tuple(_str2)
     _str1 = clr_pos(_str1)
     _str2c = clr_pos(_str2)
-    salida_json = OrderedDict()
+    salida_json = {}
     delta_results = ""
-    missing_commands = ""
-    difference_commands = ""
+    missing_commands = []
+    difference_commands = []
     try:
-      diff = diffios.Compare(_str2c, _str1)
+      diff = compare_once(_str2c, _str1)
       delta_results = diff.delta()
-      missing_commands = diff.pprint_missing()
-      difference_commands = diff.pprint_additional()
-      list_r = missing_commands.split('\n')
-      #Algorithm to order relative position of output
-      list_rs = []
-      element_princ = {}
-      element_f     = None
-      for element in list_r:
-          if not element.startswith(' '):
-              element_f  = element.rstrip()
-              element_princ[element] = []
-          else:
-              element_princ[element_f].append(element.rstrip())
-      element_princO = {}
-      element_fO     = None
-      for elem in _str2c:
-          if not elem.startswith(' '):
-              element_fO  = elem.rstrip()
-              element_princO[elem] = []
-          else:
-              element_princO[element_fO].append(elem.rstrip())
-
-      for ad in element_princ:
-        if len(ad) > 0:
-            element_princ[ad]= [b for b in element_princO[ad] if b in element_princ[ad]]
-
-      list_rs = [e for e in element_princO if e in element_princ]
-
-      list_r = []
-      for k in list_rs:
-          if k != '':
-              list_r.append(k)
-              for j in element_princ[k]:
-                  list_r.append(j)
-
-      if len(missing_commands)<1:
+      missing_commands = diff.missing_lines()
+      difference_commands = diff.additional_lines()
+      if missing_commands == ['']:
+          # nothing missing, the ordering and acl renumbering below have no work to do
           salida_json["lines_to_add_config_file"] = ""
       else:
+          list_r = missing_commands
+          #Algorithm to order relative position of output
+          list_rs = []
+          element_princ = {}
+          element_f     = None
+          for element in list_r:
+              if not element.startswith(' '):
+                  element_f  = element.rstrip()
+                  element_princ[element] = []
+              else:
+                  element_princ[element_f].append(element.rstrip())
+          element_princO = {}
+          element_fO     = None
+          for elem in _str2c:
+              if not elem.startswith(' '):
+                  element_fO  = elem.rstrip()
+                  element_princO[elem] = []
+              else:
+                  element_princO[element_fO].append(elem.rstrip())
+
+          for ad in element_princ:
+            if len(ad) > 0:
+                element_princ[ad]= [b for b in element_princO[ad] if b in element_princ[ad]]
+
+          list_rs = [e for e in element_princO if e in element_princ]
+
+          list_r = []
+          for k in list_rs:
+              if k != '':
+                  list_r.append(k)
+                  list_r.extend(element_princ[k])
+
+          # index every line of the template once, positions kept in ascending order
+          line_positions = {}
+          for pos, line in enumerate(_str2c):
+              line_positions.setdefault(line, []).append(pos)
           #with this algorithm we take a relative position of lost element in acl.
-          for line_acl in list_r:
-              if re.match(r"^ip access-list.+|^!", line_acl):
-                  try:
-                      position1 = _str2c.index(line_acl)
-                  except ValueError:
-                      position1 = None
-              if re.match(r".+permit\s+.+|.+deny\s+.+", line_acl) and position1 != None :
-                  position2 = _str2c.index(line_acl)
-                  line_acl_old = line_acl
-                  if position2 < position1:
-                      while position2 < position1:
-                          try:
-                              position2 = _str2c.index(line_acl, position2 + 1)
-                          except ValueError:
-                              break
+          for ind_acl, line_acl in enumerate(list_r):
+              if is_acl_header(line_acl):
+                  positions = line_positions.get(line_acl)
+                  position1 = positions[0] if positions else None
+              if _RE_ACL_RULE.search(line_acl, 1) and position1 != None :
+                  positions = line_positions.get(line_acl)
+                  if not positions:
+                      raise ValueError(f"{line_acl!r} is not in list")
+                  # first occurrence from the acl header on, else the last one before it
+                  position2 = positions[min(bisect.bisect_left(positions, position1), len(positions) - 1)]
                   lineposition = ((position2 - position1) * 10) - _var
-                  line_acl = ' ' + str(lineposition) + ' ' + line_acl
-                  position4 = list_r.index(line_acl_old)
-                  list_r[position4] = line_acl
+                  list_r[ind_acl] = ' ' + str(lineposition) + ' ' + line_acl
           salida_json["lines_to_add_config_file"] = list_r
       salida_json['match_type'] = _match_type
       salida_json['context_name'] = _context_name
-      salida_json['original_context'] = tpl
-      salida_json["lines_difference"] = difference_commands.split('\n')
+      salida_json['original_context'] = _str2
+      # diffios gives a single empty line when nothing is additional
+      salida_json["lines_difference"] = difference_commands if difference_commands != [''] else []
       salida_json["delta_results"] = delta_results
       _success = True
       ret_msg= "Diff algorithm run successfully"  
@@ -530,42 +794,48 @@ def find_context_var(_str1: list, _str2: list, _context_name: str, _match_type:
 
     return salida_json, _success, ret_msg
 
+# module options, built once at import
+ARGUMENT_SPEC = dict(
+    original=dict(required=True),
+    current=dict(required=True),
+    type_diff=dict(required=False, type="str", choices=("config", "context"), default="config"),
+    match_type=dict(required=False, type="str", choices=("include", "full", "var"), default="full"),
+    lines_in_context=dict(required=False,  type="str", default="3"),
+    list_char_ignore=dict(required=False,  type="list", default=["!","#"]),
+    var_diff=dict(required=False,  type="int", choices=(1, 2, 3, 4, 5, 6, 7, 8, 9, 0), default=5)
+)
+
+
 def main():
-    module = AnsibleModule(
-        argument_spec=dict(
-            original=dict(required=True),
-            current=dict(required=True),
-            type_diff=dict(required=False, type="str", choices=["config", "context"], default="config"),
-            match_type=dict(required=False, type="str", choices=["include", "full", "var"], default="full"),
-            lines_in_context=dict(required=False,  type="str", default="3"),
-            list_char_ignore=dict(required=False,  type="list", default=["!","#"]),
-            var_diff=dict(required=False,  type="int", choices=[1, 2, 3, 4, 5, 6, 7, 8, 9, 0], default=5)
-        )
-    )
+    module = AnsibleModule(argument_spec=ARGUMENT_SPEC)
     original = module.params.get("original")
     current = module.params.get("current")
     type_diff = module.params.get("type_diff")
     match_type = module.params.get("match_type")
-    lines_in_context = int(module.params.get("lines_in_context"))
     list_char_ignore = module.params.get("list_char_ignore")
     var_diff = int(module.params.get("var_diff"))
+    # lines_in_context is a string option, validate it before reading any file
+    try:
+        lines_in_context = int(module.params.get("lines_in_context"))
+    except ValueError:
+        module.fail_json(msg=f"lines_in_context debe ser un numero entero, valor {module.params.get('lines_in_context')}")
 
     # Open Files
     config_orig, config_current, success_origin_current, ret_msg = open_files(original, current)
 
     # Diff
     if success_origin_current:
-        starttime = datetime.now()
-        salida_ansible = OrderedDict()
+        # monotonic clock, the report keeps the timedelta format (H:MM:SS.ffffff)
+        starttime = time.perf_counter()
+        salida_ansible = {}
         if type_diff.lower() == "config":
-            salida, success, ret_msg = find_config_diff(config_orig, config_current, lines_in_context)
+            salida, success, ret_msg, block_snd = find_config_diff(config_orig, config_current, lines_in_context)
             # Blocks to modify
             if success:
                 salida_ansible["Diff_Results"] = salida
                 # find block of lines to replace (add or delete)
                 lines_to_add_snd = salida_ansible['Diff_Results']['lines_to_add']
                 lines_to_del_snd = salida_ansible['Diff_Results']['lines_to_delete']
-                block_snd = salida_ansible['Diff_Results']['diff']
                 ret_msg, block_lines_to_add, block_lines_to_del = find_block_of_config_to_modify(list_char_ignore,
                                                                                                  block_snd,
                                                                                                  lines_to_add_snd,
@@ -576,7 +846,9 @@ def main():
                     len(salida_ansible['Diff_Results']['lines_to_delete']) > 0 else False
                 salida_ansible['Diff_Results']['block_to_add'] = block_lines_to_add
                 salida_ansible['Diff_Results']['block_to_del'] = block_lines_to_del
-                salida_ansible["Total_execution_time"] = f"{datetime.now() - starttime}"
+                elapsed = time.perf_counter() - starttime
+                salida_ansible["Total_execution_time"] = f"{timedelta(seconds=elapsed)}"
+                salida_ansible["Total_execution_time_s"] = round(elapsed, 6)
                 module.exit_json(msg=ret_msg, content=salida_ansible)
             else:
                 module.fail_json(msg=ret_msg)
@@ -589,7 +861,9 @@ def main():
                 salida, success, ret_msg = find_context_var(config_orig, config_current, current, match_type, var_diff)
             if success:
                 salida_ansible["Diff_Results"] = salida
-                salida_ansible["Total_execution_time"] = f"{datetime.now() - starttime}"
+                elapsed = time.perf_counter() - starttime
+                salida_ansible["Total_execution_time"] = f"{timedelta(seconds=elapsed)}"
+                salida_ansible["Total_execution_time_s"] = round(elapsed, 6)
                 module.exit_json(msg=ret_msg, content=salida_ansible)
             else:
                 module.fail_json(msg=ret_msg)
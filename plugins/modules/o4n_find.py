@@ -70,38 +70,48 @@ output:
             },
             "path_file": "../documentacion/modulos/G3_Acceso.device"
         },
-        "Total_execution_time": "0:00:00.002101"
+        "Total_execution_time": "0:00:00.002101",
+        "Total_execution_time_s": 0.002101
     }
 """
 
 # Modulos
 from ansible.module_utils.basic import AnsibleModule
-from datetime import datetime
-from collections import OrderedDict
+from datetime import timedelta
+import time
 from ansible_collections.octupus.o4n_diff.plugins.module_utils.cregex import RegMatch as cr
 
 def find_regex(_file: str, _exr: str):
-    salida_json = OrderedDict()
-    line_inc_dic = OrderedDict()
+    salida_json = {}
+    line_inc_dic = {}
     lines_included = []
     try:
         reg = cr(_exr)
         file = reg.lector(_file)
-        span = reg.finditer(file)
+        groups = reg.pattern().groups
+        line_number = 1
+        last_start = 0
 
-        for match in span:
+        # una sola pasada de la expresión: cada match da su entrada en lines_included (con el
+        # mismo valor que findall: match completo, grupo único o tupla de grupos) y su span
+        for match in reg.finditer(file):
             start, end = match.span()
-            # Encontrar el número de línea
-            line_number = sum(1 for i in range(start) if file[i] == '\n') + 1
+            # Encontrar el número de línea, contando solo los \n desde el match anterior
+            line_number += file.count('\n', last_start, start)
+            last_start = start
 
+            if groups == 0:
+                lines_included.append(match.group())
+            elif groups == 1:
+                lines_included.append(match.group(1) or "")
+            else:
+                lines_included.append(match.groups(""))
             line_inc_dic[match.group()] = {
                 'start': start,
                 'end': end,
                 'line': line_number,
             }
 
-        lines_included = reg.findall(file)
-
         salida_json['exp_regular'] = _exr
         salida_json['path_file'] = _file
         salida_json["lines_included"] = lines_included
@@ -125,13 +135,16 @@ def main():
     exp_reg = module.params.get("exp_reg")
 
     # Diff with cregex
-    starttime = datetime.now()
-    salida_ansible = OrderedDict()
+    # monotonic clock, the report keeps the timedelta format (H:MM:SS.ffffff)
+    starttime = time.perf_counter()
+    salida_ansible = {}
     salida, success, ret_msg = find_regex(path_file, exp_reg)
     # Blocks to modify
     if success:
         salida_ansible["Diff_Results"] = salida
-        salida_ansible["Total_execution_time"] = f"{datetime.now() - starttime}"
+        elapsed = time.perf_counter() - starttime
+        salida_ansible["Total_execution_time"] = f"{timedelta(seconds=elapsed)}"
+        salida_ansible["Total_execution_time_s"] = round(elapsed, 6)
         module.exit_json(msg=ret_msg, content=salida_ansible)
     else:
         module.fail_json(msg=ret_msg)
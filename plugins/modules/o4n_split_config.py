@@ -72,6 +72,7 @@ msg:
     description: retorna un JSON. (ejemplo truncado)
     "content": {
         "Total_execution_time": "0:00:00.001394",
+        "Total_execution_time_s": 0.001394,
         "file_names": [
             "G3_Acceso_interface_GigabitEthernet0-1.interface",
             "G3_Acceso_interface_GigabitEthernet0-2.interface",
@@ -87,20 +88,19 @@ msg:
 
 # Modulos
 from ansible.module_utils.basic import AnsibleModule
-from datetime import datetime
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import time
 
 
 def open_files(_original):
     str1 = ""
     try:
-        f = open(_original, 'r')
+        with open(_original, 'r') as f:
+            str1 = f.read()
     except Exception as error:
-        ret_msg = f"File could not be opened {_original}, error {error}"
-    else:
-        str1 = f.read()
-        f.close()
-        ret_msg = f"file {_original} open correctly"
+        # the error is the message, not "without content"
+        return str1, False, f"File could not be opened {_original}, error {error}"
 
     if len(str1) > 0 :
         ret_msg = f"file {_original} open correctly"
@@ -112,53 +112,70 @@ def open_files(_original):
     return str1, success_origin_current, ret_msg
 
 def find_all(_str1, _parameter_start, _parameter_end):
+	# start and end of each block, every search is a C level str.find from the last position found
 	positions = []
-	position_st = 0
-	position_end = 0
-	
+	find = _str1.find
+	position_st = find(_parameter_start)
+
 	while position_st != -1:
-		position_st = _str1.find(_parameter_start,position_st)
-		if position_st != -1:
-			position_end = _str1.find(_parameter_end,position_st)
-			if position_st < position_end:
-				positions.append(position_st)
-				positions.append(position_end)
-				position_st = position_end + 1
+		position_end = find(_parameter_end, position_st)
+		if position_end == -1:
+			# no end after this start, neither after the next ones
+			break
+		if position_st < position_end:
+			positions.append(position_st)
+			positions.append(position_end)
+			position_st = find(_parameter_start, position_end + 1)
+		else:
+			position_st = find(_parameter_start, position_st + 1)
 
 	return positions
 
+def write_block(_block):
+	path, text = _block
+	with open(path, 'w') as pc:
+		pc.write(text)
+
+
+def write_blocks(_blocks: dict):
+	# each block goes to its own file, open, write and close release the GIL so the files are
+	# written from a thread pool. An error opening a file is raised as before
+	if len(_blocks) > 1:
+		with ThreadPoolExecutor(max_workers=min(16, len(_blocks))) as executor:
+			list(executor.map(write_block, _blocks.items()))
+	else:
+		for block in _blocks.items():
+			write_block(block)
+
+
 def find_section_config(_positions,_parameter,_keyword, _str1, path_file, hostname, ext):
     file_names = []
     sec_names = []
     _success = False
-    for position in range(len(_positions)):
-        try:
-            t1=_str1[_positions[position]:_positions[position+1]]
-        except:
-            t1=_str1[_positions[position]:_positions[-1]]
-
-        if t1.find(_keyword) != -1:
-            namefile=t1.split('\n')[0].split(' ')
+    # the blocks are slices of the config: a keyword missing from it can not be in any block
+    if _keyword != " " and _keyword not in _str1:
+        return True, "File successfully split", file_names, sec_names
+
+    blocks = {}
+    # every file name is <hostname>_<parameter>_<block name>.<ext>, only the block name changes
+    prefix = f"{hostname}_{_parameter}_"
+    suffix = f".{ext}"
+    # find_all returns the start and end of each block one after the other
+    for start, end in zip(_positions[0::2], _positions[1::2]):
+        # the keyword is searched inside the bounds of the block, a rejected block is never sliced
+        if _keyword == " " or _str1.find(_keyword, start, end) != -1:
+            t1=_str1[start:end]
+            # only the first line names the block, the rest of it is not split
+            namefile=t1.split('\n', 1)[0].split(' ')
             sec_names.append(namefile[-1])
-            if namefile[-1].find('/') != -1:
-                namefile=namefile[-1].replace('/', '-')
-            else:
-                namefile=namefile[-1]
-            pc = open(path_file+hostname+'_'+_parameter+'_'+namefile+"."+ext, 'w')
-            file_names.append(hostname+'_'+_parameter+'_'+namefile+"."+ext)
-            pc.write(t1)
-            pc.close()
-        elif _keyword == " ":
-            namefile=t1.split('\n')[0].split(' ')
-            sec_names.append(namefile[-1])
-            if namefile[-1].find('/') != -1:
-                namefile=namefile[-1].replace('/', '-')
-            else:
-                namefile=namefile[-1]
-            pc = open(path_file+hostname+'_'+_parameter+'_'+namefile+"."+ext, 'w')
-            file_names.append(hostname+'_'+_parameter+'_'+namefile+"."+ext)
-            pc.write(t1)
-            pc.close()
+            # "/" can not be part of a file name, replace() already returns the same name without one
+            namefile=namefile[-1].replace('/', '-')
+            file_name = prefix + namefile + suffix
+            file_names.append(file_name)
+            # a repeated name keeps the last block, as when the files were written one after the other
+            blocks[path_file+file_name] = t1
+
+    write_blocks(blocks)
 
     ret_msg="File successfully split"
     _success = True
@@ -193,9 +210,11 @@ def main():
     parameter_endf = '\n' + parameter_end
 
     # Get CFG block config
+    success = False
     if success_origin_current:
-        starttime = datetime.now()
-        salida_ansible = OrderedDict()
+        # monotonic clock, the report keeps the timedelta format (H:MM:SS.ffffff)
+        starttime = time.perf_counter()
+        salida_ansible = {}
         positions = find_all(config_orig, parameter_start, parameter_endf)
         if len(positions) > 1:
             success, ret_msg, file_names, sec_names = find_section_config(positions, parameter_start, keyword, config_orig, path_file, hostname, ext)
@@ -206,7 +225,9 @@ def main():
     if success:
         salida_ansible['sec_names'] = sec_names
         salida_ansible['file_names'] = file_names
-        salida_ansible["Total_execution_time"] = f"{datetime.now() - starttime}"
+        elapsed = time.perf_counter() - starttime
+        salida_ansible["Total_execution_time"] = f"{timedelta(seconds=elapsed)}"
+        salida_ansible["Total_execution_time_s"] = round(elapsed, 6)
         module.exit_json(msg=ret_msg, content=salida_ansible)
     else:
         module.fail_json(msg=ret_msg)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import random
+import re
+
+from ansible_collections.octupus.o4n_diff.plugins.module_utils.cregex import RegMatch
+
+
+def test_expreg_setter_stores_value_verbatim():
+    reg = RegMatch("b")
+    reg.expreg = "a"
+    assert reg.expreg == "a"
+    # la expresión nueva es la que se busca, sin prefijo agregado
+    assert reg.findall("rac a") == ["a", "a"]
+
+
+def test_finditer_file_matches_whole_file_finditer(tmp_path):
+    # ventanas chicas, los matches (a lo sumo 5 bytes) entran en el overlap
+    rng = random.Random(0)
+    path = tmp_path / "config.txt"
+    for expresion in ("a{1,4}b|ba", "b*", "ab?|", "\n|a"):
+        reg = RegMatch(expresion, case_sensitive=True)
+        for _ in range(100):
+            data = bytes(rng.choice(b"ab\n") for _ in range(rng.randint(0, 1000)))
+            path.write_bytes(data)
+            esperado = [(m.start(), m.end(), m.group()) for m in re.finditer(expresion.encode(), data)]
+            assert list(reg.finditer_file(str(path), chunk=64, overlap=8)) == esperado
+
+
+def test_conditional_group_reference_keeps_its_name():
+    # el plegado a minúsculas no debe tocar el nombre de (?(N)...)
+    texto = "xAb ac AB Ac aB"
+    for expresion in (r"(?P<N>A)?(?(N)b|c)", r"(?P<X>a)(?(X)B)", r"(A)?(?(1)B|C)"):
+        reg = RegMatch(expresion)
+        patron = re.compile(expresion, re.IGNORECASE)
+        assert reg.findall(texto) == patron.findall(texto)
+        assert reg.findall_spans(texto) == [(m.start(), m.end(), m.group()) for m in patron.finditer(texto)]
+        assert list(reg.finditer_spans(texto)) == [m.span() for m in patron.finditer(texto)]
+
+
+def test_scoped_inline_flags_keep_ignorecase():
+    # (?-i:...) quita el IGNORECASE solo en su grupo, no se puede buscar sobre el texto plegado
+    texto = "bx Bx BX bX"
+    for expresion in (r"(?-i:B)x", r"(?i:b)(?-i:X)", r"(?-i:b)X"):
+        reg = RegMatch(expresion)
+        patron = re.compile(expresion, re.IGNORECASE)
+        assert reg.findall(texto) == patron.findall(texto)
+        assert list(reg.finditer_spans(texto)) == [m.span() for m in patron.finditer(texto)]
+
+
+def test_quantifier_after_comment_makes_the_literal_optional():
+    # en B(?#c)?x el ? aplica a la B, no puede usarse como prefijo obligatorio
+    texto = "x Bx bx BBx"
+    for expresion in (r"B(?#c)?x", r"iB(?#c)*x", r"B(?#c){0,2}x", r"AB(?#c)x"):
+        for case_sensitive in (True, False):
+            reg = RegMatch(expresion, case_sensitive)
+            patron = re.compile(expresion, 0 if case_sensitive else re.IGNORECASE)
+            assert reg.findall(texto) == patron.findall(texto)
+            assert list(reg.finditer_spans(texto)) == [m.span() for m in patron.finditer(texto)]
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import difflib
+import random
+import re
+
+from ansible_collections.octupus.o4n_diff.plugins.modules import o4n_diff
+
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@$")
+
+
+def _lineas(rng, n, alfabeto=("!", " no shutdown", " exit", "interface Gi0/1", " description x")):
+    return [rng.choice(alfabeto) for _ in range(n)]
+
+
+def _contiguos(a, b, opcodes):
+    # los opcodes cubren a y b de punta a punta, sin huecos ni solapes
+    i = j = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j)
+        assert tag in ("equal", "replace", "delete", "insert")
+        if tag == "equal":
+            assert i2 - i1 == j2 - j1
+        i, j = i2, j2
+        yield tag, i1, i2, j1, j2
+    assert (i, j) == (len(a), len(b))
+
+
+def _lcs(a, b):
+    fila = [0] * (len(b) + 1)
+    for x in a:
+        anterior = fila[:]
+        for k, y in enumerate(b):
+            fila[k + 1] = anterior[k] + 1 if x == y else max(anterior[k + 1], fila[k])
+    return fila[-1]
+
+
+def _hunks_validos(a, b, salida):
+    # cada hunk respeta los rangos de su cabecera y sus lineas coinciden con a y con b
+    assert salida[:2] == ["--- original", "+++ current"]
+    k = 2
+    while k < len(salida):
+        m = _HUNK.match(salida[k])
+        assert m, salida[k]
+        inicio_a, largo_a = int(m.group(1)), int(m.group(2) or 1)
+        inicio_b, largo_b = int(m.group(3)), int(m.group(4) or 1)
+        ia = inicio_a - 1 if largo_a else inicio_a
+        ib = inicio_b - 1 if largo_b else inicio_b
+        vistos_a = vistos_b = 0
+        k += 1
+        while k < len(salida) and not salida[k].startswith("@@"):
+            marca, linea = salida[k][0], salida[k][1:]
+            if marca in " -":
+                assert a[ia + vistos_a] == linea
+                vistos_a += 1
+            if marca in " +":
+                assert b[ib + vistos_b] == linea
+                vistos_b += 1
+            k += 1
+        assert (vistos_a, vistos_b) == (largo_a, largo_b)
+
+
+def test_myers_opcodes_rebuild_str2_with_a_shortest_script():
+    rng = random.Random(0)
+    for _ in range(500):
+        a = _lineas(rng, rng.randint(0, 30))
+        b = _lineas(rng, rng.randint(0, 30))
+        opcodes = o4n_diff.myers_opcodes(a, b)
+        reconstruida = []
+        ediciones = 0
+        for tag, i1, i2, j1, j2 in _contiguos(a, b, opcodes):
+            if tag == "equal":
+                reconstruida.extend(a[i1:i2])
+            else:
+                reconstruida.extend(b[j1:j2])
+                ediciones += (i2 - i1) + (j2 - j1)
+        assert reconstruida == b
+        assert ediciones == len(a) + len(b) - 2 * _lcs(a, b)
+
+
+def test_unified_diff_gives_valid_hunks():
+    rng = random.Random(1)
+    for _ in range(300):
+        a = _lineas(rng, rng.randint(0, 40))
+        b = _lineas(rng, rng.randint(0, 40))
+        n = rng.randint(0, 4)
+        salida = list(o4n_diff.unified_diff(a, b, n))
+        if a == b:
+            assert salida == []
+        else:
+            _hunks_validos(a, b, salida)
+
+
+def test_unified_diff_matches_difflib_when_the_alignment_is_unique():
+    # lineas distintas y sin reordenar: la subsecuencia comun mas larga es una sola
+    rng = random.Random(2)
+    for _ in range(200):
+        a = [f"line {k}" for k in range(rng.randint(0, 60))]
+        b = []
+        for k, linea in enumerate(a):
+            if rng.random() < 0.2:
+                b.append(f"new {k}")
+            if rng.random() > 0.2:
+                b.append(linea)
+        n = rng.randint(0, 4)
+        esperado = list(difflib.unified_diff(a, b, "original", "current", n=n, lineterm=""))
+        assert list(o4n_diff.unified_diff(a, b, n)) == esperado
+
+
+def test_unified_diff_falls_back_to_sequence_matcher_past_max_d():
+    a = [f"a {k}" for k in range(o4n_diff._MYERS_MAX_D // 2 + 1)]
+    b = [f"b {k}" for k in range(o4n_diff._MYERS_MAX_D // 2 + 1)]
+    assert o4n_diff.myers_opcodes(a, b) is None
+    esperado = list(difflib.unified_diff(a, b, "original", "current", lineterm=""))
+    assert list(o4n_diff.unified_diff(a, b)) == esperado
+    # el limite tambien se respeta cuando se pasa explicito
+    assert o4n_diff.myers_opcodes(["x", "y"], ["z"], 2) is None
+    assert o4n_diff.myers_opcodes(["x", "y"], ["z"], 3) is not None
+
+
+def test_myers_opcodes_trims_common_head_and_tail():
+    cabeza = [f"head {k}" for k in range(2000)]
+    cola = [f"tail {k}" for k in range(2000)]
+    a = cabeza + ["old 1", "old 2"] + cola
+    b = cabeza + ["new 1"] + cola
+    # solo la region cambiada cuenta para el limite de ediciones
+    opcodes = o4n_diff.myers_opcodes(a, b, 3)
+    assert opcodes == [
+        ("equal", 0, 2000, 0, 2000),
+        ("replace", 2000, 2002, 2000, 2001),
+        ("equal", 2002, 4002, 2001, 4001),
+    ]
+    # con cambios solo en un extremo, uno de los recortes se come la secuencia entera
+    assert o4n_diff.myers_opcodes(cabeza, cabeza + cola[:5], 5) == [("equal", 0, 2000, 0, 2000), ("insert", 2000, 2000, 2000, 2005)]
+    assert o4n_diff.myers_opcodes(cabeza[:5] + cola, cola, 5) == [("delete", 0, 5, 0, 0), ("equal", 5, 2005, 0, 2000)]
+    assert o4n_diff.myers_opcodes(cabeza, cabeza) == [("equal", 0, 2000, 0, 2000)]